@@ -1,22 +1,77 @@
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping, NamedTuple
+
+# Simulated share prices; read-only so every caller sees the same fixed table
+_PRICES: Mapping[str, float] = MappingProxyType({'AAPL': 150.0, 'TSLA': 700.0, 'GOOGL': 2500.0})
+_SYMBOLS = tuple(_PRICES)
+
+# Every transaction type an Account records
+_TX_TYPES = ('deposit', 'withdraw', 'buy', 'sell')
+
+# Display templates used by the render_* methods
+_PORTFOLIO = "📊 Total Portfolio Value: ${:.2f}"
+_PROFIT = "📈 Profit: ${:.2f}"
+_LOSS = "📉 Loss: ${:.2f}"
+_STATUS = (
+    "👤 Account ID: {}\n"
+    "💰 Balance: ${:.2f}\n"
+    "📊 Portfolio Value: ${:.2f}\n"
+    "📈 Profit/Loss: ${:.2f}\n"
+    "📋 Holdings: {}"
+)
+_TX_FMT = dict(zip(_TX_TYPES, (
+    "{i}. Deposit: ${amount}\n",
+    "{i}. Withdraw: ${amount}\n",
+    "{i}. Buy {quantity} {symbol} @ ${price}\n",
+    "{i}. Sell {quantity} {symbol} @ ${price}\n",
+), strict=True))
+
+
+class AccountSnapshot(NamedTuple):
+    balance: float
+    portfolio_value: float
+    profit_loss: float
+    holdings: dict
+
+
+@dataclass(slots=True, eq=False)
 class Account:
-    def __init__(self, account_id: str, initial_deposit: float) -> None:
-        self.account_id = account_id
-        self.balance = initial_deposit
-        self.initial_deposit = initial_deposit
-        self.holdings = {}
-        self.transactions = []
-        self.transactions.append({'type': 'deposit', 'amount': initial_deposit})
+    account_id: str
+    initial_deposit: float
+    balance: float = field(init=False)
+    holdings: dict = field(init=False, default_factory=dict)
+    transactions: list = field(init=False, default_factory=list)
+    # Same transactions indexed by type at append time, for filtered views
+    _tx_by_type: dict = field(init=False, repr=False, default_factory=lambda: {tx_type: [] for tx_type in _TX_TYPES})
+    # Bumped on every mutation; snapshot() reuses its cache while it matches
+    _version: int = field(init=False, default=0, repr=False)
+    _cache: Any = field(init=False, default=None, repr=False)
+    _cache_version: int = field(init=False, default=-1, repr=False)
+    _rendered: dict = field(init=False, repr=False, default_factory=dict)
+    # One formatted history line per transaction, appended as each is recorded
+    _history_lines: list = field(init=False, repr=False, default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.balance = self.initial_deposit
+        self._record({'type': 'deposit', 'amount': self.initial_deposit})
+
+    def _record(self, transaction: dict) -> None:
+        self.transactions.append(transaction)
+        self._tx_by_type[transaction['type']].append(transaction)
+        self._history_lines.append(_TX_FMT[transaction['type']].format(i=len(self.transactions), **transaction))
+        self._version += 1
 
     def deposit(self, amount: float) -> None:
         self.balance += amount
-        self.transactions.append({'type': 'deposit', 'amount': amount})
+        self._record({'type': 'deposit', 'amount': amount})
 
     def withdraw(self, amount: float) -> bool:
         if amount > self.balance:
             print("Insufficient funds to withdraw.")
             return False
         self.balance -= amount
-        self.transactions.append({'type': 'withdraw', 'amount': amount})
+        self._record({'type': 'withdraw', 'amount': amount})
         return True
 
     def buy_shares(self, symbol: str, quantity: int) -> bool:
@@ -30,7 +85,7 @@ class Account:
             self.holdings[symbol] += quantity
         else:
             self.holdings[symbol] = quantity
-        self.transactions.append({'type': 'buy', 'symbol': symbol, 'quantity': quantity, 'price': price})
+        self._record({'type': 'buy', 'symbol': symbol, 'quantity': quantity, 'price': price})
         return True
 
     def sell_shares(self, symbol: str, quantity: int) -> bool:
@@ -42,14 +97,11 @@ class Account:
         if self.holdings[symbol] == 0:
             del self.holdings[symbol]
         self.balance += price * quantity
-        self.transactions.append({'type': 'sell', 'symbol': symbol, 'quantity': quantity, 'price': price})
+        self._record({'type': 'sell', 'symbol': symbol, 'quantity': quantity, 'price': price})
         return True
 
     def calculate_portfolio_value(self) -> float:
-        total_value = self.balance
-        for symbol, quantity in self.holdings.items():
-            total_value += quantity * get_share_price(symbol)
-        return total_value
+        return self.snapshot().portfolio_value
 
     def calculate_profit_loss(self) -> float:
         return self.calculate_portfolio_value() - self.initial_deposit
@@ -60,13 +112,58 @@ class Account:
     def get_profit_loss(self) -> float:
         return self.calculate_profit_loss()
 
-    def list_transactions(self) -> list:
-        return self.transactions
+    def list_transactions(self, tx_type: str | None = None) -> list:
+        if tx_type is None:
+            return self.transactions
+        return self._tx_by_type.get(tx_type, [])
+
+    def snapshot(self) -> AccountSnapshot:
+        if self._cache_version == self._version:
+            return self._cache
+        # Priced at current share prices, so this stays right if prices change
+        portfolio_value = self.balance
+        for symbol, quantity in self.holdings.items():
+            portfolio_value += quantity * get_share_price(symbol)
+        self._cache = AccountSnapshot(
+            balance=self.balance,
+            portfolio_value=portfolio_value,
+            profit_loss=portfolio_value - self.initial_deposit,
+            holdings=dict(self.holdings),
+        )
+        self._cache_version = self._version
+        self._rendered = {}
+        return self._cache
+
+    def _render(self, view: str, build) -> str:
+        # Rendered text lives alongside the snapshot and is dropped with it
+        snap = self.snapshot()
+        text = self._rendered.get(view)
+        if text is None:
+            text = self._rendered[view] = build(snap)
+        return text
+
+    def render_portfolio(self) -> str:
+        return self._render('portfolio', lambda snap: _PORTFOLIO.format(snap.portfolio_value))
+
+    def render_profit_loss(self) -> str:
+        def build(snap):
+            return (_PROFIT if snap.profit_loss >= 0 else _LOSS).format(snap.profit_loss)
+        return self._render('profit_loss', build)
+
+    def render_status(self) -> str:
+        def build(snap):
+            return _STATUS.format(self.account_id, snap.balance, snap.portfolio_value, snap.profit_loss, snap.holdings)
+        return self._render('status', build)
+
+    def render_history(self) -> str:
+        # Lines are formatted in _record, so a mutation doesn't re-render the whole log
+        if not self._history_lines:
+            return "No transactions yet."
+        return "📋 Transaction History:\n" + "".join(self._history_lines)
 
 
 def get_share_price(symbol: str) -> float:
-    prices = {'AAPL': 150.0, 'TSLA': 700.0, 'GOOGL': 2500.0}
-    return prices.get(symbol, 0.0)
+    return _PRICES.get(symbol, 0.0)
 
 
 def test_account() -> None:
@@ -87,4 +184,5 @@ def test_account() -> None:
     print("Total Portfolio Value:", account.calculate_portfolio_value())
     print("Profit/Loss:", account.get_profit_loss())
 
-test_account()
\ No newline at end of file
+if __name__ == '__main__':
+    test_account()
@@ -1,134 +1,211 @@
-from accounts import Account
-import gradio as gr
+import asyncio
+import functools
+import threading
+from typing import Final
 
-# Global account variable
-account = None
+from accounts import Account, _PRICES, _SYMBOLS
 
+# Accounts keyed by account_id; each account has its own lock so a handler's
+# read-modify-write on it is atomic under Gradio's thread pool
+_accounts: dict[str, Account] = {}
+_locks: dict[str, threading.RLock] = {}
+# Held while a mutating handler runs for an account, keyed by (handler, account_id),
+# so a repeated click on the same handler that arrives meanwhile is dropped
+# instead of queueing behind it
+_in_flight: dict[tuple[str, str], threading.Lock] = {}
+
+# Result message templates, filled in with str.format by the handlers
+_CREATE_OK: Final = "✅ Account created!\nID: {}\nInitial Deposit: ${}\nCurrent Balance: ${}"
+_DEPOSIT_OK: Final = "✅ Deposited: ${}\nNew Balance: ${}"
+_WITHDRAW_OK: Final = "✅ Withdrew: ${}\nNew Balance: ${}"
+_BUY_OK: Final = "✅ Bought {} shares of {}\nHoldings: {}\nBalance: ${}"
+_SELL_OK: Final = "✅ Sold {} shares of {}\nHoldings: {}\nBalance: ${}"
+
+# Fixed result messages
+_MSG_NO_ACCOUNT: Final = "❌ Please create an account first!"
+_MSG_NO_ACCOUNT_STATUS: Final = "❌ No account created yet."
+_MSG_INSUFFICIENT_WITHDRAW: Final = "❌ Insufficient funds for withdrawal."
+_MSG_INSUFFICIENT_BUY: Final = "❌ Insufficient funds to buy shares."
+_MSG_NOT_ENOUGH_SHARES: Final = "❌ Not enough shares to sell."
+_MSG_BUSY: Final = "⏳ Processing previous request"
+_MSG_ACCOUNT_EXISTS: Final = "❌ Account ID already taken. Choose another."
+_MSG_INVALID_AMOUNT: Final = "❌ Please enter an amount of $0 or more."
+_MSG_INVALID_QUANTITY: Final = "❌ Please enter a quantity of at least 1."
+
+# What gr.update() returns; leaves the corresponding output as it is
+_UNCHANGED: Final = {"__type__": "update"}
+
+def _valid_amount(amount) -> bool:
+    # A cleared gr.Number sends None
+    return amount is not None and amount >= 0
+
+def _valid_quantity(quantity) -> bool:
+    return quantity is not None and quantity >= 1
+
+def _lock_for(account_id: str) -> threading.RLock:
+    # setdefault is atomic, so concurrent first accesses agree on one lock
+    return _locks.setdefault(account_id, threading.RLock())
+
+def _run_in_thread(fn):
+    """Expose a blocking handler to Gradio as a coroutine run on a worker thread."""
+    @functools.wraps(fn)
+    async def wrapper(*args):
+        return await asyncio.to_thread(fn, *args)
+    return wrapper
+
+def _with_account(missing):
+    """Resolve the account_id argument to its Account and run the handler under
+    that account's lock; return ``missing`` if no such account exists."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(account_id, *args):
+            if account_id not in _accounts:
+                return missing
+            with _lock_for(account_id):
+                return fn(_accounts[account_id], *args)
+        return wrapper
+    return decorate
+
+def _views(account: Account):
+    """Portfolio value, profit/loss, status and history, in view_outputs order."""
+    return account.render_portfolio(), account.render_profit_loss(), account.render_status(), account.render_history()
+
+_NO_VIEWS: Final = (_MSG_NO_ACCOUNT, _MSG_NO_ACCOUNT, _MSG_NO_ACCOUNT_STATUS, _MSG_NO_ACCOUNT)
+
+def _skip_if_busy(extra_outputs: int, registered_only: bool = True):
+    """Reject a call while the same handler is already running for the account.
+
+    The rejected call reports "busy" in its message output and leaves its other
+    ``extra_outputs`` outputs unchanged. With ``registered_only``, calls for
+    unknown accounts are not guarded; the handler reports those itself.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(account_id, *args):
+            if registered_only and account_id not in _accounts:
+                return fn(account_id, *args)
+            in_flight = _in_flight.setdefault((fn.__qualname__, account_id), threading.Lock())
+            if not in_flight.acquire(blocking=False):
+                return (_MSG_BUSY,) + (_UNCHANGED,) * extra_outputs
+            try:
+                return fn(account_id, *args)
+            finally:
+                in_flight.release()
+        return wrapper
+    return decorate
+
+@_run_in_thread
+@_skip_if_busy(extra_outputs=5, registered_only=False)
 def create_account(account_id: str, initial_deposit: float):
-    global account
-    account = Account(account_id, initial_deposit)
-    return f"✅ Account created!\nID: {account_id}\nInitial Deposit: ${initial_deposit}\nCurrent Balance: ${account.balance}"
+    if not _valid_amount(initial_deposit):
+        return (_MSG_INVALID_AMOUNT,) + (_UNCHANGED,) * 5
+    with _lock_for(account_id):
+        # Accounts are shared across sessions; never replace someone else's
+        if account_id in _accounts:
+            return (_MSG_ACCOUNT_EXISTS,) + (_UNCHANGED,) * 5
+        account = Account(account_id, initial_deposit)
+        result = (_CREATE_OK.format(account_id, initial_deposit, account.balance), account_id) + _views(account)
+        _accounts[account_id] = account
+        return result
 
-def deposit_funds(amount: float):
-    if account is None:
-        return "❌ Please create an account first!"
+@_run_in_thread
+@_skip_if_busy(extra_outputs=4)
+@_with_account((_MSG_NO_ACCOUNT,) + _NO_VIEWS)
+def deposit_funds(account: Account, amount: float):
+    if not _valid_amount(amount):
+        return (_MSG_INVALID_AMOUNT,) + (_UNCHANGED,) * 4
     account.deposit(amount)
-    return f"✅ Deposited: ${amount}\nNew Balance: ${account.balance}"
-
-def withdraw_funds(amount: float):
-    if account is None:
-        return "❌ Please create an account first!"
-    success = account.withdraw(amount)
-    if success:
-        return f"✅ Withdrew: ${amount}\nNew Balance: ${account.balance}"
-    return "❌ Insufficient funds for withdrawal."
-
-def buy_shares(symbol: str, quantity: int):
-    if account is None:
-        return "❌ Please create an account first!"
-    success = account.buy_shares(symbol, quantity)
-    if success:
-        return f"✅ Bought {quantity} shares of {symbol}\nHoldings: {account.get_holdings()}\nBalance: ${account.balance}"
-    return "❌ Insufficient funds to buy shares."
-
-def sell_shares(symbol: str, quantity: int):
-    if account is None:
-        return "❌ Please create an account first!"
-    success = account.sell_shares(symbol, quantity)
-    if success:
-        return f"✅ Sold {quantity} shares of {symbol}\nHoldings: {account.get_holdings()}\nBalance: ${account.balance}"
-    return "❌ Not enough shares to sell."
-
-def portfolio_value():
-    if account is None:
-        return "❌ Please create an account first!"
-    value = account.calculate_portfolio_value()
-    return f"📊 Total Portfolio Value: ${value:.2f}"
-
-def profit_loss():
-    if account is None:
-        return "❌ Please create an account first!"
-    profit_loss = account.get_profit_loss()
-    status = "📈 Profit" if profit_loss >= 0 else "📉 Loss"
-    return f"{status}: ${profit_loss:.2f}"
-
-def transaction_history():
-    if account is None:
-        return "❌ Please create an account first!"
-    transactions = account.list_transactions()
-    if not transactions:
-        return "No transactions yet."
-    
-    history = "📋 Transaction History:\n"
-    for i, transaction in enumerate(transactions, 1):
-        if transaction['type'] == 'deposit':
-            history += f"{i}. Deposit: ${transaction['amount']}\n"
-        elif transaction['type'] == 'withdraw':
-            history += f"{i}. Withdraw: ${transaction['amount']}\n"
-        elif transaction['type'] == 'buy':
-            history += f"{i}. Buy {transaction['quantity']} {transaction['symbol']} @ ${transaction['price']}\n"
-        elif transaction['type'] == 'sell':
-            history += f"{i}. Sell {transaction['quantity']} {transaction['symbol']} @ ${transaction['price']}\n"
-    
-    return history
+    return (_DEPOSIT_OK.format(amount, account.balance),) + _views(account)
 
-def get_account_status():
-    if account is None:
-        return "❌ No account created yet."
-    
-    status = f"👤 Account ID: {account.account_id}\n"
-    status += f"💰 Balance: ${account.balance:.2f}\n"
-    status += f"📊 Portfolio Value: ${account.calculate_portfolio_value():.2f}\n"
-    status += f"📈 Profit/Loss: ${account.get_profit_loss():.2f}\n"
-    status += f"📋 Holdings: {account.get_holdings()}"
-    return status
+@_run_in_thread
+@_skip_if_busy(extra_outputs=4)
+@_with_account((_MSG_NO_ACCOUNT,) + _NO_VIEWS)
+def withdraw_funds(account: Account, amount: float):
+    if not _valid_amount(amount):
+        return (_MSG_INVALID_AMOUNT,) + (_UNCHANGED,) * 4
+    if account.withdraw(amount):
+        return (_WITHDRAW_OK.format(amount, account.balance),) + _views(account)
+    return (_MSG_INSUFFICIENT_WITHDRAW,) + _views(account)
+
+@_run_in_thread
+@_skip_if_busy(extra_outputs=4)
+@_with_account((_MSG_NO_ACCOUNT,) + _NO_VIEWS)
+def buy_shares(account: Account, symbol: str, quantity: int):
+    if not _valid_quantity(quantity):
+        return (_MSG_INVALID_QUANTITY,) + (_UNCHANGED,) * 4
+    if account.buy_shares(symbol, quantity):
+        snap = account.snapshot()
+        return (_BUY_OK.format(quantity, symbol, snap.holdings, snap.balance),) + _views(account)
+    return (_MSG_INSUFFICIENT_BUY,) + _views(account)
+
+@_run_in_thread
+@_skip_if_busy(extra_outputs=4)
+@_with_account((_MSG_NO_ACCOUNT,) + _NO_VIEWS)
+def sell_shares(account: Account, symbol: str, quantity: int):
+    if not _valid_quantity(quantity):
+        return (_MSG_INVALID_QUANTITY,) + (_UNCHANGED,) * 4
+    if account.sell_shares(symbol, quantity):
+        snap = account.snapshot()
+        return (_SELL_OK.format(quantity, symbol, snap.holdings, snap.balance),) + _views(account)
+    return (_MSG_NOT_ENOUGH_SHARES,) + _views(account)
+
+@_run_in_thread
+@_with_account(_MSG_NO_ACCOUNT)
+def transaction_history(account: Account):
+    return account.render_history()
+
+@_run_in_thread
+@_with_account(_NO_VIEWS[:3])
+def refresh_portfolio(account: Account):
+    """Portfolio value, profit/loss and status from one snapshot in one round trip."""
+    return account.render_portfolio(), account.render_profit_loss(), account.render_status()
 
 # Create the interface
 def create_interface():
+    # Imported here so importing this module (tests, tooling) doesn't pay for Gradio
+    import gradio as gr
+
     with gr.Blocks(title="Trading Simulation Platform", theme=gr.themes.Soft()) as demo:
         gr.Markdown("# 🏦 Trading Simulation Platform")
         gr.Markdown("Create an account and start trading with simulated stock prices!")
+        account_state = gr.State()
         
         with gr.Row():
             with gr.Column(scale=1):
                 gr.Markdown("## 🆕 Create Account")
                 account_id = gr.Textbox(label="Account ID", placeholder="Enter your account ID", value="user123")
-                initial_deposit = gr.Slider(0, 10000, step=100, label="Initial Deposit ($)", value=1000)
+                initial_deposit = gr.Number(label="Initial Deposit ($)", value=1000, precision=2, minimum=0, maximum=10000)
                 create_btn = gr.Button("Create Account", variant="primary")
                 create_output = gr.Textbox(label="Account Status", interactive=False, lines=4)
             
             with gr.Column(scale=1):
                 gr.Markdown("## 💰 Account Operations")
-                deposit_amount = gr.Slider(0, 5000, step=50, label="Deposit Amount ($)", value=0)
+                deposit_amount = gr.Number(label="Deposit Amount ($)", value=0, precision=2, minimum=0, maximum=5000)
                 deposit_btn = gr.Button("Deposit", variant="secondary")
                 deposit_output = gr.Textbox(label="Deposit Result", interactive=False, lines=3)
                 
-                withdraw_amount = gr.Slider(0, 5000, step=50, label="Withdraw Amount ($)", value=0)
+                withdraw_amount = gr.Number(label="Withdraw Amount ($)", value=0, precision=2, minimum=0, maximum=5000)
                 withdraw_btn = gr.Button("Withdraw", variant="secondary")
                 withdraw_output = gr.Textbox(label="Withdraw Result", interactive=False, lines=3)
         
         with gr.Row():
             with gr.Column(scale=1):
                 gr.Markdown("## 📈 Trading Operations")
-                buy_symbol = gr.Textbox(label="Stock Symbol", placeholder="AAPL, TSLA, GOOGL", value="AAPL")
-                buy_quantity = gr.Slider(1, 100, step=1, label="Buy Quantity", value=1)
+                buy_symbol = gr.Dropdown(choices=list(_SYMBOLS), label="Stock Symbol", value=_SYMBOLS[0])
+                buy_quantity = gr.Number(label="Buy Quantity", value=1, precision=0, minimum=1, maximum=100)
                 buy_btn = gr.Button("Buy Shares", variant="secondary")
                 buy_output = gr.Textbox(label="Buy Result", interactive=False, lines=4)
                 
-                sell_symbol = gr.Textbox(label="Stock Symbol", placeholder="AAPL, TSLA, GOOGL", value="AAPL")
-                sell_quantity = gr.Slider(1, 100, step=1, label="Sell Quantity", value=1)
+                sell_symbol = gr.Dropdown(choices=list(_SYMBOLS), label="Stock Symbol", value=_SYMBOLS[0])
+                sell_quantity = gr.Number(label="Sell Quantity", value=1, precision=0, minimum=1, maximum=100)
                 sell_btn = gr.Button("Sell Shares", variant="secondary")
                 sell_output = gr.Textbox(label="Sell Result", interactive=False, lines=4)
             
             with gr.Column(scale=1):
                 gr.Markdown("## 📊 Portfolio Information")
-                portfolio_btn = gr.Button("Get Portfolio Value", variant="secondary")
+                refresh_btn = gr.Button("Refresh Portfolio", variant="secondary")
                 portfolio_output = gr.Textbox(label="Portfolio Value", interactive=False, lines=2)
-                
-                profit_loss_btn = gr.Button("Get Profit/Loss", variant="secondary")
                 profit_loss_output = gr.Textbox(label="Profit/Loss", interactive=False, lines=2)
-                
-                status_btn = gr.Button("Account Status", variant="secondary")
                 status_output = gr.Textbox(label="Account Status", interactive=False, lines=6)
                 
                 history_btn = gr.Button("Transaction History", variant="secondary")
@@ -136,21 +213,21 @@ def create_interface():
         
         # Stock prices info
         gr.Markdown("### 📊 Current Stock Prices")
-        gr.Markdown("- **AAPL**: $150.00")
-        gr.Markdown("- **TSLA**: $700.00") 
-        gr.Markdown("- **GOOGL**: $2,500.00")
+        for symbol, price in _PRICES.items():
+            gr.Markdown(f"- **{symbol}**: ${price:,.2f}")
         
-        # Event handlers
-        create_btn.click(create_account, inputs=[account_id, initial_deposit], outputs=create_output)
-        deposit_btn.click(deposit_funds, inputs=deposit_amount, outputs=deposit_output)
-        withdraw_btn.click(withdraw_funds, inputs=withdraw_amount, outputs=withdraw_output)
-        buy_btn.click(buy_shares, inputs=[buy_symbol, buy_quantity], outputs=buy_output)
-        sell_btn.click(sell_shares, inputs=[sell_symbol, sell_quantity], outputs=sell_output)
-        portfolio_btn.click(portfolio_value, outputs=portfolio_output)
-        profit_loss_btn.click(profit_loss, outputs=profit_loss_output)
-        status_btn.click(get_account_status, outputs=status_output)
-        history_btn.click(transaction_history, outputs=history_output)
+        # Event handlers; account changes also refresh every view in the same round trip
+        view_outputs = [portfolio_output, profit_loss_output, status_output, history_output]
+        create_btn.click(create_account, inputs=[account_id, initial_deposit], outputs=[create_output, account_state] + view_outputs)
+        deposit_btn.click(deposit_funds, inputs=[account_state, deposit_amount], outputs=[deposit_output] + view_outputs)
+        withdraw_btn.click(withdraw_funds, inputs=[account_state, withdraw_amount], outputs=[withdraw_output] + view_outputs)
+        buy_btn.click(buy_shares, inputs=[account_state, buy_symbol, buy_quantity], outputs=[buy_output] + view_outputs)
+        sell_btn.click(sell_shares, inputs=[account_state, sell_symbol, sell_quantity], outputs=[sell_output] + view_outputs)
+        refresh_btn.click(refresh_portfolio, inputs=account_state, outputs=[portfolio_output, profit_loss_output, status_output])
+        history_btn.click(transaction_history, inputs=account_state, outputs=history_output)
     
+    # Let handlers overlap however the app is launched, not only via __main__
+    demo.queue(default_concurrency_limit=8)
     return demo
 
 # Launch the interface
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+import pytest
+import app
+from accounts import Account
+
+
+@pytest.fixture(autouse=True)
+def registry(monkeypatch):
+    # Each test gets an empty account registry and fresh locks
+    monkeypatch.setattr(app, '_accounts', {})
+    monkeypatch.setattr(app, '_locks', {})
+    monkeypatch.setattr(app, '_in_flight', {})
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_create_account_registers_account():
+    result = run(app.create_account('user123', 1000.0))
+    assert result[0].startswith("✅ Account created!")
+    assert result[1] == 'user123'
+    assert app._accounts['user123'].balance == 1000.0
+
+
+def test_taken_id_is_refused():
+    run(app.create_account('user123', 1000.0))
+    account = app._accounts['user123']
+    result = run(app.create_account('user123', 50.0))
+    assert result == (app._MSG_ACCOUNT_EXISTS,) + (app._UNCHANGED,) * 5
+    assert app._accounts == {'user123': account}
+    assert account.balance == 1000.0
+
+
+@pytest.mark.parametrize("amount", [None, -1.0])
+def test_create_account_rejects_invalid_deposit(amount):
+    result = run(app.create_account('user123', amount))
+    assert result == (app._MSG_INVALID_AMOUNT,) + (app._UNCHANGED,) * 5
+    assert app._accounts == {}
+
+
+@pytest.mark.parametrize("handler", [app.deposit_funds, app.withdraw_funds])
+@pytest.mark.parametrize("amount", [None, -1.0])
+def test_invalid_amount_is_rejected(handler, amount):
+    run(app.create_account('user123', 1000.0))
+    result = run(handler('user123', amount))
+    assert result == (app._MSG_INVALID_AMOUNT,) + (app._UNCHANGED,) * 4
+    assert app._accounts['user123'].balance == 1000.0
+
+
+@pytest.mark.parametrize("handler", [app.buy_shares, app.sell_shares])
+@pytest.mark.parametrize("quantity", [None, 0])
+def test_invalid_quantity_is_rejected(handler, quantity):
+    run(app.create_account('user123', 1000.0))
+    result = run(handler('user123', 'AAPL', quantity))
+    assert result == (app._MSG_INVALID_QUANTITY,) + (app._UNCHANGED,) * 4
+
+
+@pytest.mark.parametrize("account_id", [None, 'nobody'])
+def test_unknown_account_returns_no_views(account_id):
+    assert run(app.deposit_funds(account_id, 10.0)) == (app._MSG_NO_ACCOUNT,) + app._NO_VIEWS
+    assert run(app.buy_shares(account_id, 'AAPL', 1)) == (app._MSG_NO_ACCOUNT,) + app._NO_VIEWS
+    assert run(app.refresh_portfolio(account_id)) == app._NO_VIEWS[:3]
+    assert run(app.transaction_history(account_id)) == app._MSG_NO_ACCOUNT
+    assert app._in_flight == {}
+
+
+def test_repeat_of_running_handler_is_busy(monkeypatch):
+    entered, release = threading.Event(), threading.Event()
+    deposit = Account.deposit
+
+    def slow_deposit(self, amount):
+        entered.set()
+        release.wait(5)
+        deposit(self, amount)
+
+    run(app.create_account('user123', 1000.0))
+    monkeypatch.setattr(Account, 'deposit', slow_deposit)
+
+    async def scenario():
+        first = asyncio.create_task(app.deposit_funds('user123', 10.0))
+        await asyncio.to_thread(entered.wait, 5)
+        repeat = await app.deposit_funds('user123', 10.0)
+        # A different handler waits for the account lock instead of being refused
+        other = asyncio.create_task(app.withdraw_funds('user123', 5.0))
+        while not app._in_flight.get(('withdraw_funds', 'user123'), threading.Lock()).locked():
+            await asyncio.sleep(0.001)
+        release.set()
+        return await first, repeat, await other
+
+    first, repeat, other = run(scenario())
+    assert repeat == (app._MSG_BUSY,) + (app._UNCHANGED,) * 4
+    assert first[0].startswith("✅ Deposited: $10.0")
+    assert other[0].startswith("✅ Withdrew: $5.0")
+    assert app._accounts['user123'].balance == 1005.0